@@ -1,19 +1,218 @@
 # Prints out the binary representation of ipv4 addresses
 
+import os
 import sys
 
-if len(sys.argv) == 1 or (len(sys.argv) == 2 and (sys.argv[1].lower() == "--help" or sys.argv[1].lower() == "-h")):
-	print("python3 ip_bin.py {ipv4_addr_1} {ipv4_addr_2} ...")
-	sys.exit(1)
-
-for arg in range(1, len(sys.argv)):
-	split = sys.argv[arg].split('.')
-	if len(split) != 4:
-		print(f"{sys.argv[arg]} is invalid.")
-		continue
-	try:	
-		bin = ' '.join(['{0:08b}'.format(int(i)) for i in split])
-		if len(bin) != 35: raise Exception()
-		print(f"{sys.argv[arg]}	{bin}")
-	except:
-		print(f"{sys.argv[arg]} is invalid.")	
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+OCTET_BIN = ['{0:08b}'.format(i) for i in range(256)]
+OCTET_VALUE = {str(i): i for i in range(256)}
+FORMATS = ("octets", "raw", "mask")
+CHUNK_SIZE = 65536
+VECTOR_THRESHOLD = 2048
+
+
+def get_arguments(argv: list)->list:
+    """
+    Return a list of command-line arguments.
+    Return only the option if its value is missing.
+    """
+    args = []
+    i = 0
+    while(i < len(argv)):
+        a = argv[i].strip()
+        match a:
+            case "-i" | "-o" | "-f" | "-m":
+                try:
+                    args.append([a, argv[i + 1].strip()])
+                    i += 1
+                except:
+                    return a
+            case _:
+                args.append([None, a])
+        i += 1
+    return args
+
+def parse_octets(ip_addr: str)->list:
+    """
+    Split a dot-decimal IPv4 address into a list of four integer octets.
+    None will be returned for invalid arguments.
+    """
+    split = ip_addr.split('.')
+    if len(split) != 4: return None
+    octets = []
+    for i in split:
+        o = OCTET_VALUE.get(i)
+        if o is None:
+            try: o = int(i)
+            except: return None
+            if o < 0 or o > 255: return None
+        octets.append(o)
+    return octets
+
+def get_separators(fmt: str, prefix: int=None)->dict:
+    """
+    Build the separators inserted between bits for the given output format.
+    Keys are bit positions (0-32), values are the separator placed before that bit.
+    The mask format marks the network/host boundary with '|', leading for /0 and trailing for /32.
+    """
+    if fmt == "raw": return {}
+    seps = {8: ' ', 16: ' ', 24: ' '}
+    if fmt == "mask" and prefix is not None and 0 <= prefix <= 32:
+        seps[prefix] = '|'
+    return seps
+
+def get_mask_prefix(mask: str)->int:
+    """
+    Calculate the number of network bits in a dot-decimal or slash notation subnet mask.
+    None will be returned for invalid arguments.
+    """
+    # imported here so that ip_range (and scipy, for slash notation) is only loaded for the mask format
+    from ip_range import get_dotted_mask_bin, get_slash_mask_bin
+    if mask.startswith('/'): mask_bin = get_slash_mask_bin(mask)
+    else: mask_bin = get_dotted_mask_bin(mask)
+    if mask_bin is None: return None
+    return mask_bin.count('1')
+
+def octets_to_bin(octets: list, seps: dict)->str:
+    """
+    Convert four integer octets to a binary string laid out with the given separators.
+    """
+    raw = OCTET_BIN[octets[0]] + OCTET_BIN[octets[1]] + OCTET_BIN[octets[2]] + OCTET_BIN[octets[3]]
+    if not seps: return raw
+    pieces = []
+    start = 0
+    for pos in sorted(seps):
+        pieces.append(raw[start:pos])
+        pieces.append(seps[pos])
+        start = pos
+    pieces.append(raw[start:])
+    return ''.join(pieces)
+
+def octets_to_bin_vectorized(octets: list, seps: dict)->list:
+    """
+    Convert a flat list of octets (four per address) to binary strings using numpy.
+    Addresses are packed into a uint32 array and their bits written into a fixed-width ASCII matrix.
+    """
+    arr = np.array(octets, dtype=np.uint32).reshape(-1, 4)
+    addrs = (arr[:, 0] << 24) | (arr[:, 1] << 16) | (arr[:, 2] << 8) | arr[:, 3]
+    shifts = np.arange(31, -1, -1, dtype=np.uint32)
+    bits = ((addrs[:, None] >> shifts) & 1).astype(np.uint8) + ord('0')
+
+    template = []
+    columns = []
+    for pos in range(32):
+        if pos in seps: template.extend(seps[pos].encode())
+        columns.append(len(template))
+        template.append(0)
+    if 32 in seps: template.extend(seps[32].encode())
+    width = len(template)
+    out = np.tile(np.array(template, dtype=np.uint8), (len(addrs), 1))
+    out[:, columns] = bits
+    block = out.tobytes().decode('ascii')
+    return [block[i:i + width] for i in range(0, len(block), width)]
+
+def convert_chunk(lines: list, seps: dict)->list:
+    """
+    Convert a chunk of addresses into output lines.
+    Large chunks are converted with numpy when it is available.
+    """
+    parsed = [parse_octets(i) for i in lines]
+    valid = [i for i in parsed if i is not None]
+    if np is not None and len(valid) >= VECTOR_THRESHOLD:
+        flat = [o for i in valid for o in i]
+        converted = iter(octets_to_bin_vectorized(flat, seps))
+        bins = [next(converted) if i is not None else None for i in parsed]
+    else:
+        bins = [octets_to_bin(i, seps) if i is not None else None for i in parsed]
+    return [f"{addr}	{b}" if b is not None else f"{addr} is invalid." for addr, b in zip(lines, bins)]
+
+def read_chunks(file, size: int=CHUNK_SIZE):
+    """
+    Yield lists of non-empty, stripped lines from a file in chunks of the given size.
+    """
+    chunk = []
+    for line in file:
+        line = line.strip()
+        if not line: continue
+        chunk.append(line)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk: yield chunk
+
+def write_bin(chunks, output, seps: dict):
+    """
+    Convert each chunk of addresses and write the results to the output with a single write per chunk.
+    """
+    for chunk in chunks:
+        output.write('\n'.join(convert_chunk(chunk, seps)) + '\n')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 1 or (len(sys.argv) == 2 and (sys.argv[1].lower() == "--help" or sys.argv[1].lower() == "-h")):
+        print("""python3 ip_bin.py {ipv4_addr_1} {ipv4_addr_2} ... [options]
+    -i <file>: read newline separated addresses from a file ('-' for stdin)
+    -o <file>: write output to a file instead of stdout
+    -f <format>: output format, one of octets (default), raw, mask
+    -m <subnet_mask>: subnet mask used by the mask format (dot-decimal or slash notation)""")
+        sys.exit(1)
+
+    args = get_arguments(sys.argv[1:])
+    if type(args) == type(""):
+        print(f"Missing argument for {args}.")
+        sys.exit(2)
+
+    options = {a[0]: a[1] for a in args if a[0] is not None}
+    addrs = [a[1] for a in args if a[0] is None]
+
+    fmt = options.get("-f", "octets").lower()
+    if fmt not in FORMATS:
+        print(f"Invalid argument: -f {options['-f']}")
+        sys.exit(3)
+
+    prefix = None
+    if fmt == "mask":
+        if "-m" not in options:
+            print("The mask format requires a subnet mask (-m).")
+            sys.exit(4)
+        prefix = get_mask_prefix(options["-m"])
+        if prefix is None:
+            print(f"{options['-m']} is invalid.")
+            sys.exit(5)
+    seps = get_separators(fmt, prefix)
+
+    chunks = []
+    if addrs: chunks.append(addrs)
+
+    output = sys.stdout
+    if "-o" in options:
+        try: output = open(options["-o"], 'w', buffering=1 << 20)
+        except OSError:
+            print(f"{options['-o']} could not be opened.")
+            sys.exit(7)
+
+    input_file = None
+    if "-i" in options:
+        if options["-i"] == '-': input_file = sys.stdin
+        else:
+            try: input_file = open(options["-i"], 'r')
+            except OSError:
+                print("File not found.")
+                if output is not sys.stdout: output.close()
+                sys.exit(6)
+
+    try:
+        write_bin(chunks, output, seps)
+        if input_file is not None: write_bin(read_chunks(input_file), output, seps)
+        output.flush()
+    except BrokenPipeError:
+        # the reader (e.g. head) closed the pipe; point stdout at devnull so the final flush does not fail again
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    finally:
+        if input_file is not None and input_file is not sys.stdin: input_file.close()
+        if output is not sys.stdout: output.close()
@@ -2,7 +2,6 @@
 
 import sys
 import math
-import scipy.integrate as integrate
 
 def get_ip_bin(ip_addr: str)->str:
     """
@@ -40,6 +39,8 @@ def get_slash_mask_bin(mask: str)->str:
     Calculate the binary representation of a given IPv4 slash notation subnet mask.
     None will be returned for invalid arguments.
     """
+    # imported here so that scipy is only needed for slash notation masks
+    import scipy.integrate as integrate
     try:
         v = int(mask[1:])
         if v < 0 or v > 32: return None
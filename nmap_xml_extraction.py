@@ -12,11 +12,11 @@ JSON & CSV output is optional for more data.
 Improved from nmap_xml_discovery.py found at https://github.com/jasonholloway125/SubnetUtilities.
 """
 
-import requests
 import json
 import os
 import sys
 import xml.etree.ElementTree as ET
+from probe_scheduler import schedule_probes
 
 __ARGS__ = {
     "help": "-h",
@@ -107,7 +107,7 @@ def data_to_text(data: list, ports_only:list=None, ports_any:list=None, ports_nu
     Convert the IP Addresses in the data list into a strings separated by newline.
     """
 
-    text = ""
+    hosts = []
     for i in data[1:]:
         if os_match and not len(i["os"]):
             continue
@@ -123,10 +123,17 @@ def data_to_text(data: list, ports_only:list=None, ports_any:list=None, ports_nu
         addr = [j for j in i["addr"] if j["addrtype"] == "ipv4" or j["addrtype"] == "ipv6"]
         if not addr:
             continue
-        if server_up_ports and not (len([j for j in i["ports"] if j["portid"] in ["80", "8080", "443", "8443"]]) > 0 and (are_servers_up(addr=[j['addr'] for j in addr], timeout=server_up_ports) or are_servers_up(addr=[j['name'] for j in i["hostnames"]], timeout=server_up_ports))):
-            continue
-        if server_up and not (are_servers_up(addr=[j['addr'] for j in addr], timeout=server_up_ports) or are_servers_up(addr=[j['name'] for j in i["hostnames"]], timeout=server_up_ports)):
+        if server_up_ports and not len([j for j in i["ports"] if j["portid"] in ["80", "8080", "443", "8443"]]) > 0:
             continue
+        hosts.append((i, addr))
+
+    if server_up or server_up_ports:
+        targets = [j['addr'] for i, addr in hosts for j in addr] + [j['name'] for i, addr in hosts for j in i["hostnames"]]
+        live = get_live_servers(targets, timeout=server_up_ports if server_up_ports else server_up)
+        hosts = [(i, addr) for i, addr in hosts if [j for j in addr if j['addr'] in live] or [j for j in i["hostnames"] if j['name'] in live]]
+
+    text = ""
+    for i, addr in hosts:
         if rtn_domain:
             for j in i["hostnames"]: text += j["name"] + "\n"
         else:
@@ -195,23 +202,13 @@ def port_str_to_list(port_str:str)->list[str]:
     except:
         return None
     
-def are_servers_up(addr:list[str], timeout:int)->bool:
+def get_live_servers(addr:list[str], timeout:int)->set[str]:
     """
-    Return True if an IP address within a list of IP addresses has an online web server.
-    Returns False for otherwise.
+    Return the set of IP addresses/domain names within a list that have an online web server.
+    Addresses are probed concurrently by the subnet-aware scheduler in probe_scheduler.py.
+    Subnets are never deprioritised or abandoned, since Nmap has already reported these hosts as up.
     """
-    for i in addr:
-        try:
-            requests.get(f"http://{i}", timeout=timeout)
-            return True
-        except:
-            try:
-                requests.get(f"https://{i}", timeout=timeout)
-                return True
-            except:
-                continue
-    return False
-
+    return set([i["target"] for i in schedule_probes(list(dict.fromkeys(addr)), timeout=timeout, deprioritize_after=0, abandon_after=0) if i["status"] is not None])
 
 
 if __name__ == '__main__':
@@ -0,0 +1,190 @@
+"""
+Adaptive web server probe scheduler.
+
+Targets are grouped by subnet (using the ip_range.py math) and probed concurrently with a cap on the number of
+probes in flight per subnet. Connect timeouts are derived from the response times observed in each subnet, and subnets returning
+consecutive timeouts and no other sign of life are deprioritised and optionally abandoned, so black-holed address space
+does not burn the full timeout for every address.
+"""
+
+import sys
+import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from ip_range import get_ip_bin, set_host_bits, bin_to_decimal
+
+SUBNET_PREFIX = 24
+WORKERS = 32
+PER_SUBNET = 4
+MIN_TIMEOUT = 3.0
+DEPRIORITIZE_AFTER = 3
+ABANDON_AFTER = 8
+
+
+def get_subnet(target: str, mask_bin: str, prefix: int)->str:
+    """
+    Return the network address of a target in slash notation, e.g. 10.0.0.0/24.
+    Targets that are not IPv4 addresses (domain names, IPv6) are their own group.
+    """
+    ip = get_ip_bin(target)
+    if ip is None or mask_bin is None: return target
+    return f"{bin_to_decimal(set_host_bits(ip, mask_bin, '0'))}/{prefix}"
+
+def group_targets(targets: list[str], prefix: int=SUBNET_PREFIX)->dict:
+    """
+    Group targets by subnet, keeping their input order within each subnet.
+    """
+    mask_bin = '1' * prefix + '0' * (32 - prefix)
+    subnets = {}
+    for i in targets:
+        key = get_subnet(i, mask_bin, prefix)
+        if key not in subnets:
+            subnets[key] = {"subnet": key, "pending": deque(), "in_flight": 0, "timeouts": 0, "responded": 0, "rtt": {}}
+        subnets[key]["pending"].append(i)
+    return subnets
+
+def update_rtt(rtt: dict, sample: float):
+    """
+    Update a smoothed round trip time and its variance with a new sample (RFC 6298).
+    """
+    if "srtt" not in rtt:
+        rtt["srtt"] = sample
+        rtt["rttvar"] = sample / 2
+    else:
+        rtt["rttvar"] = 0.75 * rtt["rttvar"] + 0.25 * abs(rtt["srtt"] - sample)
+        rtt["srtt"] = 0.875 * rtt["srtt"] + 0.125 * sample
+
+def get_timeout(rtt: dict, max_timeout: float, min_timeout: float=MIN_TIMEOUT)->float:
+    """
+    Derive a timeout from round trip time statistics, bounded by the given minimum and maximum.
+    The minimum defaults to 3 seconds so that a connect survives one lost SYN (retransmitted after about 1 second).
+    The maximum is returned when there are no samples yet.
+    """
+    if "srtt" not in rtt: return max_timeout
+    return max(min(min_timeout, max_timeout), min(max_timeout, rtt["srtt"] + 4 * rtt["rttvar"]))
+
+def probe(target: str, connect_timeout: float, read_timeout: float, schemes: tuple=("http", "https"))->dict:
+    """
+    Send a GET request to the target using each scheme in turn until one responds.
+    A connect timeout only shows that the port is filtered, so the remaining schemes are always tried.
+    timed_out is True when every scheme timed out while connecting.
+    rtt is the time until the response headers arrived, a conservative stand-in for the connect time since it includes server processing.
+    """
+    result = {"target": target, "scheme": None, "status": None, "length": None, "rtt": None, "timed_out": False}
+    answered = False
+    for scheme in schemes:
+        try:
+            page = requests.get(f"{scheme}://{target}", timeout=(connect_timeout, read_timeout))
+        except requests.exceptions.ConnectTimeout:
+            result["timed_out"] = not answered
+            continue
+        except:
+            answered = True
+            result["timed_out"] = False
+            continue
+        result["scheme"] = scheme
+        result["status"] = page.status_code
+        result["length"] = len(page.content)
+        result["rtt"] = page.elapsed.total_seconds()
+        result["timed_out"] = False
+        return result
+    return result
+
+def is_deprioritized(subnet: dict, deprioritize_after: int)->bool:
+    """
+    Return True if the subnet has returned consecutive timeouts and nothing in it has ever answered.
+    """
+    return bool(deprioritize_after) and subnet["timeouts"] >= deprioritize_after and not subnet["responded"]
+
+def next_subnet(subnets: list, per_subnet: int, deprioritize_after: int)->dict:
+    """
+    Pick the next subnet to probe in round-robin order.
+    Subnets with consecutive timeouts and no other sign of life are only picked when no other subnet can be probed.
+    The chosen subnet is moved to the back of the list.
+    """
+    fallback = None
+    for i, s in enumerate(subnets):
+        if not s["pending"] or s["in_flight"] >= per_subnet: continue
+        if is_deprioritized(s, deprioritize_after):
+            if fallback is None: fallback = i
+            continue
+        subnets.append(subnets.pop(i))
+        return s
+    if fallback is None: return None
+    s = subnets.pop(fallback)
+    subnets.append(s)
+    return s
+
+def schedule_probes(targets: list[str], timeout: float, schemes: tuple=("http", "https"), workers: int=WORKERS, per_subnet: int=PER_SUBNET, prefix: int=SUBNET_PREFIX, min_timeout: float=MIN_TIMEOUT, deprioritize_after: int=DEPRIORITIZE_AFTER, abandon_after: int=ABANDON_AFTER, on_result=None)->list[dict]:
+    """
+    Probe the targets for web servers and return a list of results in completion order.
+    Each result holds the target, the scheme and status code of the response (None if no response),
+    the content length, the round trip time, whether the probe timed out and whether its subnet was abandoned.
+    timeout is the upper bound for both connecting and reading. Connect timeouts shrink towards the response times
+    observed in the same subnet; subnets without a response yet use the full timeout.
+    A subnet is abandoned after abandon_after consecutive timeouts if nothing in it has ever answered (0 disables).
+    on_result is called with each result as soon as it is available.
+    """
+    groups = group_targets(targets, prefix)
+    subnets = list(groups.values())
+    results = []
+    in_flight = {}
+
+    def record(result: dict):
+        results.append(result)
+        if on_result is not None: on_result(result)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            while len(in_flight) < workers:
+                s = next_subnet(subnets, per_subnet, deprioritize_after)
+                if s is None: break
+                target = s["pending"].popleft()
+                s["in_flight"] += 1
+                connect_timeout = get_timeout(s["rtt"], timeout, min_timeout)
+                in_flight[pool.submit(probe, target, connect_timeout, timeout, schemes)] = s
+            if not in_flight: break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                s = in_flight.pop(future)
+                s["in_flight"] -= 1
+                result = future.result()
+                result["abandoned"] = False
+                if result["timed_out"]:
+                    s["timeouts"] += 1
+                else:
+                    s["timeouts"] = 0
+                    s["responded"] += 1
+                    if result["status"] is not None:
+                        update_rtt(s["rtt"], result["rtt"])
+                record(result)
+
+                if abandon_after and s["timeouts"] >= abandon_after and not s["responded"]:
+                    while s["pending"]:
+                        record({"target": s["pending"].popleft(), "scheme": None, "status": None, "length": None, "rtt": None, "timed_out": False, "abandoned": True})
+    return results
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1].lower() == "--help" or sys.argv[1].lower() == "-h":
+        print("""python3 probe_scheduler.py {target_1} {target_2} ... [-a <abandon_after>]
+    -a <num>: abandon a subnet after this many consecutive timeouts with no sign of life (0 disables, default 8)""")
+        sys.exit(1)
+
+    targets = sys.argv[1:]
+    abandon_after = ABANDON_AFTER
+    if "-a" in targets:
+        i = targets.index("-a")
+        try:
+            abandon_after = int(targets[i + 1])
+            if abandon_after < 0: raise ValueError()
+        except (IndexError, ValueError):
+            print("Invalid argument for -a.")
+            sys.exit(2)
+        targets = targets[:i] + targets[i + 2:]
+
+    for r in schedule_probes(targets, timeout=10, abandon_after=abandon_after):
+        if r["abandoned"]: print(f"{r['target']}: subnet abandoned")
+        elif r["status"] is None: print(f"{r['target']}: no response")
+        else: print(f"{r['target']}: {r['scheme']} {r['status']} ({r['rtt']:.2f}s)")
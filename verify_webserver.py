@@ -5,15 +5,25 @@ Prints status code and content length.
 Creates file of IP addresses that returned 200 status codes.
 """
 
-import requests
 import sys
 import os
+from probe_scheduler import schedule_probes, ABANDON_AFTER
 
 
-if len(sys.argv) != 3:
-        print("python3 verify_webserver.py <input_newline_ips_txt> <output_ips_200>")
+if len(sys.argv) not in (3, 5) or (len(sys.argv) == 5 and sys.argv[3] != "-a"):
+        print("python3 verify_webserver.py <input_newline_ips_txt> <output_ips_200> [-a <abandon_after>]")
+        print(f"    -a <num>: abandon a subnet after this many consecutive timeouts with no sign of life (0 disables, default {ABANDON_AFTER})")
         sys.exit(1)
 
+abandon_after = ABANDON_AFTER
+if len(sys.argv) == 5:
+        try:
+                abandon_after = int(sys.argv[4])
+                if abandon_after < 0: raise ValueError()
+        except ValueError:
+                print(f"Invalid argument: -a {sys.argv[4]}")
+                sys.exit(2)
+
 input_path = sys.argv[1]
 
 if not os.path.exists(input_path):
@@ -21,18 +31,15 @@ if not os.path.exists(input_path):
         sys.exit(1)
 
 with open(input_path, 'r') as file:
-        addr = [i.strip() for i in file.readlines()]
+        addr = [i.strip() for i in file.readlines() if i.strip()]
 
-ip_200 = []
+def print_result(result: dict):
+        if result["status"] is not None:
+                print(f"Request for http://{result['target']}:\nStatus: {result['status']}\nContent Length: {result['length']}")
 
-for i in addr:
-        try:
-                page = requests.get(f"http://{i}", timeout=10)
-                print(f"Request for http://{i}:\nStatus: {page.status_code}\nContent Length: {len(page.content)}")
-                if page.status_code == 200:
-                        ip_200.append(i)
-        except:
-                pass
+results = schedule_probes(addr, timeout=10, schemes=("http",), abandon_after=abandon_after, on_result=print_result)
+ok = set([i["target"] for i in results if i["status"] == 200])
+ip_200 = [i for i in addr if i in ok]
 
 with open(sys.argv[2], 'w') as file:
         file.write('\n'.join(ip_200))